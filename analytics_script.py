@@ -2,8 +2,18 @@ import pandas as pd
 import os
 import numpy as np
 import uuid
+import matplotlib
+matplotlib.use('Agg')  # headless raster backend: no GUI figure managers
 import matplotlib.pyplot as plt
 
+# Polars is an optional accelerator: its Parquet/CSV readers parse in
+# parallel with Arrow-native memory. When it is not installed the script
+# works identically through pandas.
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
 # --- Configuration ---
 INPUT_DIR = 'normalized_output'
 
@@ -14,21 +24,71 @@ INPUT_FILES = {
     'interactions': os.path.join(INPUT_DIR, 'interactions.csv')
 }
 
+# Columns the insight code aggregates numerically. A CSV column whose
+# values are all empty (e.g. rating when no interaction is a COOK_ATTEMPT)
+# is inferred as String by the Polars reader, which would crash the
+# mean() aggregations downstream, so read_table casts these back to float
+# when the inference missed.
+NUMERIC_COLUMNS = ('rating', 'prep_time_minutes')
+
 # --- Data Loading and Preparation ---
+def read_table(file_key):
+    """
+    Reads one normalized table, preferring the Parquet copy written by the
+    ETL (typed, columnar -- no CSV text parsing or dtype re-inference) and
+    falling back to the CSV when only that exists.
+    """
+    parquet_path = INPUT_FILES[file_key].replace('.csv', '.parquet')
+    if pl is not None:
+        # Multi-threaded Polars read, handed over to pandas for the
+        # merge/insight code below.
+        if os.path.exists(parquet_path):
+            return pl.read_parquet(parquet_path).to_pandas()
+        frame = pl.read_csv(INPUT_FILES[file_key])
+        casts = [pl.col(column).cast(pl.Float64)
+                 for column in NUMERIC_COLUMNS
+                 if column in frame.columns and not frame.schema[column].is_numeric()]
+        if casts:
+            frame = frame.with_columns(casts)
+        return frame.to_pandas()
+    if os.path.exists(parquet_path):
+        return pd.read_parquet(parquet_path, engine='pyarrow', dtype_backend='pyarrow')
+    return pd.read_csv(INPUT_FILES[file_key], dtype_backend='pyarrow')
+
+
+def type_stats(interaction_stats, interaction_type):
+    """
+    Per-recipe stats for one interaction type, or an empty recipe-indexed
+    frame when that type has no rows at all. The groupby is observed=True,
+    so an absent type is simply missing from the index level and xs() on it
+    would raise KeyError instead of degrading to zero counts.
+    """
+    if interaction_type in interaction_stats.index.get_level_values('interaction_type'):
+        return interaction_stats.xs(interaction_type, level='interaction_type')
+    return interaction_stats.droplevel('interaction_type').iloc[0:0]
+
+
 def load_and_merge_data():
-    """Loads CSV files and merges them for analysis."""
+    """Loads the normalized tables and merges them for analysis."""
     try:
-        # Load DataFrames
-        recipes_df = pd.read_csv(INPUT_FILES['recipe'])
-        ingredients_df = pd.read_csv(INPUT_FILES['ingredients'])
-        interactions_df = pd.read_csv(INPUT_FILES['interactions'])
+        # Load DataFrames (Parquet preserves the numeric dtypes, so no
+        # pd.to_numeric coercion pass is needed here anymore)
+        recipes_df = read_table('recipe')
+        ingredients_df = read_table('ingredients')
+        steps_df = read_table('steps')
+        interactions_df = read_table('interactions')
 
-        # Data Cleaning/Type Conversion (Essential for analysis)
-        recipes_df['prep_time_minutes'] = pd.to_numeric(recipes_df['prep_time_minutes'], errors='coerce')
-        interactions_df['rating'] = pd.to_numeric(interactions_df['rating'], errors='coerce')
+        # 3-value label columns: category dtype stores int8 codes, so the
+        # groupbys and == filters on them compare small integers instead of
+        # hashing a string per row (and the columns shrink ~8x in memory).
+        recipes_df['difficulty'] = recipes_df['difficulty'].astype('category')
+        interactions_df['interaction_type'] = interactions_df['interaction_type'].astype('category')
 
-        # Create 'name_clean' column (already done in mock script, but ensuring for robustness)
-        ingredients_df['name_clean'] = ingredients_df['name'].astype(str).str.strip()
+        # Create 'name_clean' column (already done in mock script, but ensuring
+        # for robustness). The names arrive Arrow-backed from read_table, so
+        # str.strip() runs in Arrow's vectorized UTF-8 kernel rather than one
+        # Python string call per row.
+        ingredients_df['name_clean'] = ingredients_df['name'].str.strip()
 
         # Merge Recipes and Interactions for engagement analysis
         recipe_interaction_df = pd.merge(
@@ -46,87 +106,145 @@ def load_and_merge_data():
             how='left'
         )
 
-        return recipes_df, ingredients_df, interactions_df, recipe_interaction_df, ingredient_recipe_df
+        # One pass over interactions covers every per-recipe/per-type stat
+        # the charts and insights need (view and like counts, average rating,
+        # unique users) instead of a separate filter + groupby scan for each.
+        interaction_stats = interactions_df.groupby(['recipe_id', 'interaction_type'], observed=True) \
+                                           .agg(cnt=('user_id', 'size'),
+                                                avg_rating=('rating', 'mean'),
+                                                uniq_users=('user_id', 'nunique'))
+
+        # These two value_counts each feed both a chart and an insight, so
+        # run the hash-count once here (Insight 3 derives its percentage
+        # distribution from the same counts).
+        difficulty_counts = recipes_df['difficulty'].value_counts()
+        ingredient_counts = ingredients_df['name_clean'].value_counts()
+
+        # The cook-attempt slice of the merged frame is needed by both chart 3
+        # and Insight 7; filter it once here instead of rebuilding the
+        # interaction_type mask at each use.
+        cook_attempts_df = recipe_interaction_df[recipe_interaction_df['interaction_type'] == 'COOK_ATTEMPT']
+
+        # The Top-5 views ranking is needed by both the charts and the
+        # insights, so compute it once here and share it. Mapping recipe
+        # names onto the Series index replaces the old reset_index + merge
+        # round-trip through a throwaway DataFrame.
+        recipe_names = recipes_df.set_index('recipe_id')['name']
+        views_ranked = type_stats(interaction_stats, 'VIEW')['cnt'] \
+            .sort_values(ascending=False).head(5)
+        views_ranked.index = views_ranked.index.map(recipe_names)
+
+        return {
+            'recipes': recipes_df,
+            'ingredients': ingredients_df,
+            'steps': steps_df,
+            'interactions': interactions_df,
+            'recipe_interaction': recipe_interaction_df,
+            'ingredient_recipe': ingredient_recipe_df,
+            'cook_attempts': cook_attempts_df,
+            'difficulty_counts': difficulty_counts,
+            'ingredient_counts': ingredient_counts,
+            'interaction_stats': interaction_stats,
+            'recipe_names': recipe_names,
+            'views_ranked': views_ranked
+        }
 
     except FileNotFoundError as e:
         print(f"ERROR: Could not find necessary input files. Run the ETL and Validation steps first. Missing: {e}")
-        return None, None, None, None, None
+        return None
     except Exception as e:
         print(f"An error occurred during data loading or merging: {e}")
-        return None, None, None, None, None
+        return None
 
 # --- Visualization Generation Function ---
-def generate_visualizations(recipes_df, ingredients_df, interactions_df):
+def generate_visualizations(data):
     """Generates and saves key visualization charts."""
     print("\nGenerating Visualization Charts...")
     os.makedirs(INPUT_DIR, exist_ok=True)
 
+    cook_attempts_df = data['cook_attempts']
+    difficulty_counts = data['difficulty_counts']
+    ingredient_counts = data['ingredient_counts']
+    views_ranked = data['views_ranked']
+
     plt.style.use('ggplot')
 
+    # One Figure reused for all four charts avoids spinning up (and tearing
+    # down) a figure manager per plot. Each chart gets a fresh subplot via
+    # fig.clf(): ax.clear() is not enough, because ax.pie() turns the frame
+    # off and pins the aspect ratio to 1.0, and clear() resets neither --
+    # leaving the later bar charts without panel/gridlines and squeezed into
+    # a square plot area.
+    fig, ax = plt.subplots(figsize=(7, 7))
+
     # 1. Recipe Difficulty Distribution (Pie Chart)
-    difficulty_counts = recipes_df['difficulty'].value_counts()
-    plt.figure(figsize=(7, 7))
-    plt.pie(difficulty_counts, labels=difficulty_counts.index, autopct='%1.1f%%', startangle=90, wedgeprops={'edgecolor': 'black'})
-    plt.title('Recipe Difficulty Distribution', fontsize=14)
-    plt.savefig(os.path.join(INPUT_DIR, '01_difficulty_distribution.png'))
-    plt.close()
+    ax.pie(difficulty_counts, labels=difficulty_counts.index, autopct='%1.1f%%', startangle=90, wedgeprops={'edgecolor': 'black'})
+    ax.set_title('Recipe Difficulty Distribution', fontsize=14)
+    fig.savefig(os.path.join(INPUT_DIR, '01_difficulty_distribution.png'))
 
     # 2. Top 5 Most Viewed Recipes (Bar Chart)
-    views_per_recipe = interactions_df[interactions_df['interaction_type'] == 'VIEW'] \
-                                     .groupby('recipe_id').size().reset_index(name='total_views')
-    views_ranked = pd.merge(views_per_recipe, recipes_df[['recipe_id', 'name']], on='recipe_id') \
-                         .sort_values(by='total_views', ascending=False).head(5)
-
-    plt.figure(figsize=(10, 6))
-    plt.bar(views_ranked['name'], views_ranked['total_views'], color='skyblue')
-    plt.title('Top 5 Most Viewed Recipes', fontsize=14)
-    plt.xlabel('Recipe Name', fontsize=12)
-    plt.ylabel('Total Views', fontsize=12)
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
-    plt.savefig(os.path.join(INPUT_DIR, '02_top_viewed_recipes.png'))
-    plt.close()
+    fig.clf()
+    ax = fig.add_subplot(111)
+    fig.set_size_inches(10, 6)
+    ax.bar(views_ranked.index, views_ranked.values, color='skyblue')
+    ax.set_title('Top 5 Most Viewed Recipes', fontsize=14)
+    ax.set_xlabel('Recipe Name', fontsize=12)
+    ax.set_ylabel('Total Views', fontsize=12)
+    plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+    fig.tight_layout()
+    fig.savefig(os.path.join(INPUT_DIR, '02_top_viewed_recipes.png'))
 
     # 3. Average Rating by Difficulty (Bar Chart)
-    recipe_interaction_df = pd.merge(recipes_df, interactions_df, on='recipe_id', how='left')
-    difficulty_ratings = recipe_interaction_df[recipe_interaction_df['interaction_type'] == 'COOK_ATTEMPT'] \
-                                            .groupby('difficulty')['rating'].mean().round(2).sort_values(ascending=False)
-
-    plt.figure(figsize=(8, 5))
-    plt.bar(difficulty_ratings.index, difficulty_ratings.values, color=['green', 'orange', 'red'])
-    plt.title('Average Rating by Difficulty Level', fontsize=14)
-    plt.xlabel('Difficulty', fontsize=12)
-    plt.ylabel('Average Rating (1-5)', fontsize=12)
+    difficulty_ratings = cook_attempts_df.groupby('difficulty', observed=True)['rating'] \
+                                         .mean().round(2).sort_values(ascending=False)
+
+    fig.clf()
+    ax = fig.add_subplot(111)
+    fig.set_size_inches(8, 5)
+    ax.bar(difficulty_ratings.index, difficulty_ratings.values, color=['green', 'orange', 'red'])
+    ax.set_title('Average Rating by Difficulty Level', fontsize=14)
+    ax.set_xlabel('Difficulty', fontsize=12)
+    ax.set_ylabel('Average Rating (1-5)', fontsize=12)
     if not difficulty_ratings.empty:
-        plt.ylim(difficulty_ratings.min() * 0.95, 5.0) 
+        ax.set_ylim(difficulty_ratings.min() * 0.95, 5.0)
     else:
-        plt.ylim(3.0, 5.0) 
-    plt.tight_layout()
-    plt.savefig(os.path.join(INPUT_DIR, '03_avg_rating_by_difficulty.png'))
-    plt.close()
+        ax.set_ylim(3.0, 5.0)
+    fig.tight_layout()
+    fig.savefig(os.path.join(INPUT_DIR, '03_avg_rating_by_difficulty.png'))
 
     # 4. Top 5 Most Common Ingredients (Bar Chart)
-    common_ingredients = ingredients_df['name_clean'].value_counts().head(5)
-
-    plt.figure(figsize=(10, 6))
-    plt.bar(common_ingredients.index, common_ingredients.values, color='teal')
-    plt.title('Top 5 Most Common Ingredients', fontsize=14)
-    plt.xlabel('Ingredient Name', fontsize=12)
-    plt.ylabel('Count Across Recipes', fontsize=12)
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
-    plt.savefig(os.path.join(INPUT_DIR, '04_top_common_ingredients.png'))
-    plt.close()
+    common_ingredients = ingredient_counts.head(5)
+
+    fig.clf()
+    ax = fig.add_subplot(111)
+    fig.set_size_inches(10, 6)
+    ax.bar(common_ingredients.index, common_ingredients.values, color='teal')
+    ax.set_title('Top 5 Most Common Ingredients', fontsize=14)
+    ax.set_xlabel('Ingredient Name', fontsize=12)
+    ax.set_ylabel('Count Across Recipes', fontsize=12)
+    plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+    fig.tight_layout()
+    fig.savefig(os.path.join(INPUT_DIR, '04_top_common_ingredients.png'))
+
+    plt.close(fig)
 
     print("4 Visualization charts saved to 'normalized_output/' directory.")
 
 # --- Analytics Calculations ---
-def generate_insights(recipes_df, ingredients_df, interactions_df, recipe_interaction_df, ingredient_recipe_df):
+def generate_insights(data):
     """Calculates and presents the required 10+ insights."""
     insights = []
-    
+
+    recipes_df = data['recipes']
+    steps_df = data['steps']
+    interactions_df = data['interactions']
+    cook_attempts_df = data['cook_attempts']
+    ingredient_recipe_df = data['ingredient_recipe']
+    interaction_stats = data['interaction_stats']
+    views_ranked = data['views_ranked']
+
     # --- INSIGHT 1: Most Common Ingredients ---
-    common_ingredients = ingredients_df['name_clean'].value_counts().head(5)
+    common_ingredients = data['ingredient_counts'].head(5)
     insights.append({
         "ID": 1,
         "Name": "Most Common Ingredients",
@@ -134,7 +252,10 @@ def generate_insights(recipes_df, ingredients_df, interactions_df, recipe_intera
     })
 
     # --- INSIGHT 2: Average Preparation Time ---
-    avg_prep_time = recipes_df['prep_time_minutes'].mean().round(2)
+    # round() the plain Python way: Arrow-backed columns (the pandas path
+    # when Polars is absent) return a builtin float from mean(), which has
+    # no .round() method
+    avg_prep_time = round(float(recipes_df['prep_time_minutes'].mean()), 2)
     insights.append({
         "ID": 2,
         "Name": "Average Preparation Time (Minutes)",
@@ -142,7 +263,8 @@ def generate_insights(recipes_df, ingredients_df, interactions_df, recipe_intera
     })
 
     # --- INSIGHT 3: Difficulty Distribution ---
-    difficulty_dist = recipes_df['difficulty'].value_counts(normalize=True).mul(100).round(2)
+    difficulty_counts = data['difficulty_counts']
+    difficulty_dist = difficulty_counts.div(difficulty_counts.sum()).mul(100).round(2)
     insights.append({
         "ID": 3,
         "Name": "Recipe Difficulty Distribution (%)",
@@ -150,12 +272,16 @@ def generate_insights(recipes_df, ingredients_df, interactions_df, recipe_intera
     })
 
     # --- INSIGHT 4: Correlation between Prep Time and Likes ---
-    likes_per_recipe = interactions_df[interactions_df['interaction_type'] == 'LIKE'] \
-                                     .groupby('recipe_id').size().reset_index(name='total_likes')
-                                     
-    prep_like_df = pd.merge(recipes_df, likes_per_recipe, on='recipe_id', how='left').fillna(0)
-    
-    correlation = prep_like_df[['prep_time_minutes', 'total_likes']].corr().iloc[0, 1].round(4)
+    # Align like counts to the recipe order with reindex (recipes with no
+    # likes count as 0) instead of merging through a throwaway DataFrame.
+    likes_per_recipe = type_stats(interaction_stats, 'LIKE')['cnt'] \
+        .reindex(recipes_df['recipe_id'], fill_value=0)
+
+    # Only one cell of the corr() matrix was used; np.corrcoef on the raw
+    # arrays skips the DataFrame wrapper.
+    prep_times = np.nan_to_num(recipes_df['prep_time_minutes'].to_numpy(dtype=float))
+    total_likes = likes_per_recipe.to_numpy(dtype=float)
+    correlation = round(float(np.corrcoef(prep_times, total_likes)[0, 1]), 4)
     insights.append({
         "ID": 4,
         "Name": "Correlation (Prep Time vs. Likes)",
@@ -163,28 +289,23 @@ def generate_insights(recipes_df, ingredients_df, interactions_df, recipe_intera
     })
 
     # --- INSIGHT 5: Most Frequently Viewed Recipes ---
-    views_per_recipe = interactions_df[interactions_df['interaction_type'] == 'VIEW'] \
-                                     .groupby('recipe_id').size().reset_index(name='total_views')
-    
-    views_ranked = pd.merge(views_per_recipe, recipes_df[['recipe_id', 'name']], on='recipe_id') \
-                         .sort_values(by='total_views', ascending=False).head(5)
-                         
     insights.append({
         "ID": 5,
         "Name": "Top 5 Most Viewed Recipes",
-        "Result": views_ranked.set_index('name')['total_views'].to_dict()
+        "Result": views_ranked.to_dict()
     })
 
     # --- INSIGHT 6: Ingredients Associated with High Engagement (Avg. Rating) ---
-    avg_ratings = interactions_df[interactions_df['interaction_type'] == 'COOK_ATTEMPT'] \
-                                .groupby('recipe_id')['rating'].mean().round(2).reset_index(name='avg_rating')
-    
-    high_rated_recipes = avg_ratings[avg_ratings['avg_rating'] >= 4.0]['recipe_id']
-    
-    high_engagement_ingredients = ingredient_recipe_df[
-        ingredient_recipe_df['recipe_id'].isin(high_rated_recipes)
-    ]['name_clean'].value_counts().head(5)
-    
+    avg_ratings = type_stats(interaction_stats, 'COOK_ATTEMPT')['avg_rating'].round(2)
+
+    high_rated_recipes = avg_ratings[avg_ratings >= 4.0].index.to_frame(index=False)
+
+    # Inner hash-join against the high-rated ids: pandas' C-level join beats
+    # an isin() probe that hashes every recipe_id string against a Python set
+    high_engagement_ingredients = ingredient_recipe_df.merge(
+        high_rated_recipes, on='recipe_id', how='inner'
+    )['name_clean'].value_counts().head(5)
+
     insights.append({
         "ID": 6,
         "Name": "Top 5 Ingredients in High-Rated Recipes (Avg Rating >= 4.0)",
@@ -192,8 +313,8 @@ def generate_insights(recipes_df, ingredients_df, interactions_df, recipe_intera
     })
     
     # --- INSIGHT 7: Average Rating per Difficulty Level ---
-    difficulty_ratings = recipe_interaction_df[recipe_interaction_df['interaction_type'] == 'COOK_ATTEMPT'] \
-                                            .groupby('difficulty')['rating'].mean().round(2).sort_values(ascending=False)
+    difficulty_ratings = cook_attempts_df.groupby('difficulty', observed=True)['rating'] \
+                                         .mean().round(2).sort_values(ascending=False)
     insights.append({
         "ID": 7,
         "Name": "Average Rating by Difficulty",
@@ -201,8 +322,9 @@ def generate_insights(recipes_df, ingredients_df, interactions_df, recipe_intera
     })
 
     # --- INSIGHT 8: Average Number of Steps per Recipe ---
-    steps_df = pd.read_csv(INPUT_FILES['steps'])
-    steps_count = steps_df.groupby('recipe_id').size().mean().round(2)
+    # mean of per-recipe group sizes == total rows / distinct recipes,
+    # so skip building the groupby hash table
+    steps_count = round(len(steps_df) / steps_df['recipe_id'].nunique(), 2)
     insights.append({
         "ID": 8,
         "Name": "Average Number of Steps per Recipe",
@@ -219,7 +341,7 @@ def generate_insights(recipes_df, ingredients_df, interactions_df, recipe_intera
     
     # --- INSIGHT 10: Percentage of Recipes that have been 'COOK_ATTEMPT'ed ---
     total_recipes = len(recipes_df)
-    attempted_recipes = interactions_df[interactions_df['interaction_type'] == 'COOK_ATTEMPT']['recipe_id'].nunique()
+    attempted_recipes = len(type_stats(interaction_stats, 'COOK_ATTEMPT'))
     
     attempt_percentage = round((attempted_recipes / total_recipes * 100), 2)
     
@@ -230,17 +352,14 @@ def generate_insights(recipes_df, ingredients_df, interactions_df, recipe_intera
     })
     
     # --- INSIGHT 11: Most Liked Recipe by Unique User Count (Bonus Insight) ---
-    unique_likes = interactions_df[interactions_df['interaction_type'] == 'LIKE'] \
-                                  .drop_duplicates(subset=['recipe_id', 'user_id']) \
-                                  .groupby('recipe_id').size().reset_index(name='unique_likes')
-                                  
-    most_unique_liked = pd.merge(recipes_df[['recipe_id', 'name']], unique_likes, on='recipe_id') \
-                              .sort_values(by='unique_likes', ascending=False).head(1)
-                              
+    most_unique_liked = type_stats(interaction_stats, 'LIKE')['uniq_users'] \
+        .sort_values(ascending=False).head(1)
+    most_unique_liked.index = most_unique_liked.index.map(data['recipe_names'])
+
     insights.append({
         "ID": 11,
         "Name": "Most Liked Recipe by Unique User Count",
-        "Result": most_unique_liked.set_index('name')['unique_likes'].to_dict()
+        "Result": most_unique_liked.to_dict()
     })
 
     return insights
@@ -261,13 +380,13 @@ def print_insights(insights):
 
 # --- Main Execution ---
 if __name__ == "__main__":
-    
-    recipes_df, ingredients_df, interactions_df, recipe_interaction_df, ingredient_recipe_df = load_and_merge_data()
 
-    if recipes_df is not None:
+    data = load_and_merge_data()
+
+    if data is not None:
         # 1. Generate and save the Visualization Charts
-        generate_visualizations(recipes_df, ingredients_df, interactions_df)
+        generate_visualizations(data)
 
         # 2. Generate and print the Analytical Insights Summary
-        insights = generate_insights(recipes_df, ingredients_df, interactions_df, recipe_interaction_df, ingredient_recipe_df)
+        insights = generate_insights(data)
         print_insights(insights)
\ No newline at end of file
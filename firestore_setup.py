@@ -2,8 +2,8 @@ import firebase_admin
 from firebase_admin import credentials
 from firebase_admin import firestore
 import datetime
-import random
 import uuid
+import numpy as np
 
 # --- 1. INITIALIZE FIREBASE APP ---
 try:
@@ -79,37 +79,54 @@ realistic_ingredients = [
 ]
 
 difficulties = ["Easy", "Medium", "Hard"]
+units = ["cup", "tsp", "tbsp", "g", "ml", "whole"]
+
+# Batched RNG: draw every random value for the synthetic batch up front with
+# vectorized NumPy calls instead of one scalar random.* call per field.
+# (.tolist() converts to plain Python values, which Firestore requires.)
+rng = np.random.default_rng()
+num_recipes = 19
+
+ingredient_counts = rng.integers(4, 11, size=num_recipes).tolist()
+step_counts = rng.integers(3, 8, size=num_recipes).tolist()
+serves_draws = rng.integers(1, 7, size=num_recipes).tolist()
+prep_time_draws = rng.integers(5, 31, size=num_recipes).tolist()
+cook_time_draws = rng.integers(10, 61, size=num_recipes).tolist()
+difficulty_draws = rng.choice(difficulties, size=num_recipes).tolist()
+age_day_draws = rng.integers(1, 366, size=num_recipes).tolist()
+
+total_ingredients = sum(ingredient_counts)
+ingredient_names = rng.choice(realistic_ingredients, size=total_ingredients).tolist()
+ingredient_quantities = rng.uniform(0.1, 3.0, size=total_ingredients).round(2).tolist()
+ingredient_units = rng.choice(units, size=total_ingredients).tolist()
 
 synthetic_recipes = []
-
-for i in range(2, 21):
-    recipe_id = f"R{i:03d}"
-
-    # random ingredients
-    embedded_ingredients = []
-    for j in range(random.randint(4, 10)):
-        embedded_ingredients.append({
-            "name": random.choice(realistic_ingredients),
-            "quantity": round(random.uniform(0.1, 3.0), 2),
-            "unit": random.choice(["cup", "tsp", "tbsp", "g", "ml", "whole"])
-        })
-
-    # random steps
-    embedded_steps = []
-    for k in range(random.randint(3, 7)):
-        embedded_steps.append({
-            "step_number": k + 1,
-            "description": f"Step {k+1}: Follow standard cooking procedure."
-        })
+offset = 0
+
+for i in range(num_recipes):
+    # slice this recipe's share of the pre-drawn ingredient columns
+    count = ingredient_counts[i]
+    embedded_ingredients = [
+        {"name": name, "quantity": quantity, "unit": unit}
+        for name, quantity, unit in zip(ingredient_names[offset:offset + count],
+                                        ingredient_quantities[offset:offset + count],
+                                        ingredient_units[offset:offset + count])
+    ]
+    offset += count
+
+    embedded_steps = [
+        {"step_number": k + 1, "description": f"Step {k+1}: Follow standard cooking procedure."}
+        for k in range(step_counts[i])
+    ]
 
     recipe = {
-        "recipe_id": recipe_id,
-        "name": real_recipe_names.pop(0),
-        "serves": random.randint(1, 6),
-        "prep_time_minutes": random.randint(5, 30),
-        "cook_time_minutes": random.randint(10, 60),
-        "difficulty": random.choice(difficulties),
-        "created_at": datetime.datetime.now() - datetime.timedelta(days=random.randint(1, 365)),
+        "recipe_id": f"R{i + 2:03d}",
+        "name": real_recipe_names[i],
+        "serves": serves_draws[i],
+        "prep_time_minutes": prep_time_draws[i],
+        "cook_time_minutes": cook_time_draws[i],
+        "difficulty": difficulty_draws[i],
+        "created_at": datetime.datetime.now() - datetime.timedelta(days=age_day_draws[i]),
         "ingredients": embedded_ingredients,
         "steps": embedded_steps
     }
@@ -123,13 +140,15 @@ human_names = [
     "Vikram Nair", "Shruti Deshmukh"
 ]
 
+join_age_draws = rng.integers(10, 501, size=len(human_names)).tolist()
+
 users_data = []
 for i in range(1, 11):
     user_id = f"U{i:03d}"
     users_data.append({
         "user_id": user_id,
         "username": human_names[i-1],
-        "join_date": datetime.datetime.now() - datetime.timedelta(days=random.randint(10, 500))
+        "join_date": datetime.datetime.now() - datetime.timedelta(days=join_age_draws[i-1])
     })
 
 # D. INTERACTION DATA
@@ -138,59 +157,79 @@ all_recipe_ids = [f"R{i:03d}" for i in range(1, 21)]
 interaction_types = ["VIEW", "LIKE", "COOK_ATTEMPT"]
 user_ids = [u["user_id"] for u in users_data]
 
-# Random interactions
-for i in range(50):
-    user_id = random.choice(user_ids)
-    recipe_id = random.choice(all_recipe_ids)
-    interaction_type = random.choices(interaction_types, weights=[70, 20, 10], k=1)[0]
-    rating = random.randint(3, 5) if interaction_type == "COOK_ATTEMPT" else None
+# Random interactions (all draws batched, then zipped into documents)
+num_interactions = 50
+chosen_users = rng.choice(user_ids, size=num_interactions).tolist()
+chosen_recipes = rng.choice(all_recipe_ids, size=num_interactions).tolist()
+chosen_types = rng.choice(interaction_types, size=num_interactions, p=[0.7, 0.2, 0.1]).tolist()
+rating_draws = rng.integers(3, 6, size=num_interactions).tolist()
+minute_draws = rng.integers(1, 1001, size=num_interactions).tolist()
 
+for user_id, recipe_id, interaction_type, rating, minutes in zip(
+        chosen_users, chosen_recipes, chosen_types, rating_draws, minute_draws):
     interactions_data.append({
         "interaction_id": str(uuid.uuid4()),
         "user_id": user_id,
         "recipe_id": recipe_id,
         "interaction_type": interaction_type,
-        "rating": rating,
-        "timestamp": datetime.datetime.now() - datetime.timedelta(minutes=random.randint(1, 1000))
+        "rating": rating if interaction_type == "COOK_ATTEMPT" else None,
+        "timestamp": datetime.datetime.now() - datetime.timedelta(minutes=minutes)
     })
 
 # Extra engagement for R001
-for _ in range(5):
+like_users = rng.choice(user_ids, size=5).tolist()
+like_minutes = rng.integers(1, 51, size=5).tolist()
+for user_id, minutes in zip(like_users, like_minutes):
     interactions_data.append({
         "interaction_id": str(uuid.uuid4()),
-        "user_id": random.choice(user_ids),
+        "user_id": user_id,
         "recipe_id": "R001",
         "interaction_type": "LIKE",
         "rating": None,
-        "timestamp": datetime.datetime.now() - datetime.timedelta(minutes=random.randint(1, 50))
+        "timestamp": datetime.datetime.now() - datetime.timedelta(minutes=minutes)
     })
 
-for _ in range(3):
+cook_users = rng.choice(user_ids, size=3).tolist()
+cook_ratings = rng.integers(4, 6, size=3).tolist()
+cook_minutes = rng.integers(1, 51, size=3).tolist()
+for user_id, rating, minutes in zip(cook_users, cook_ratings, cook_minutes):
     interactions_data.append({
         "interaction_id": str(uuid.uuid4()),
-        "user_id": random.choice(user_ids),
+        "user_id": user_id,
         "recipe_id": "R001",
         "interaction_type": "COOK_ATTEMPT",
-        "rating": random.randint(4, 5),
-        "timestamp": datetime.datetime.now() - datetime.timedelta(minutes=random.randint(1, 50))
+        "rating": rating,
+        "timestamp": datetime.datetime.now() - datetime.timedelta(minutes=minutes)
     })
 
 
 # --- 3. UPLOAD FUNCTION ---
+BATCH_SIZE = 500  # Firestore allows up to 500 writes per batched commit
+
+
 def upload_data(collection_name, data_list, document_id_field=None):
     print(f"\nStarting upload to '{collection_name}'...")
     collection_ref = db.collection(collection_name)
     uploaded_count = 0
 
-    for item in data_list:
-        try:
+    # Commit in batches of up to 500 writes so each network round-trip
+    # carries many documents instead of one.
+    for start in range(0, len(data_list), BATCH_SIZE):
+        chunk = data_list[start:start + BATCH_SIZE]
+        batch = db.batch()
+
+        for item in chunk:
             if document_id_field:
-                collection_ref.document(item[document_id_field]).set(item)
+                doc_ref = collection_ref.document(item[document_id_field])
             else:
-                collection_ref.add(item)
-            uploaded_count += 1
+                doc_ref = collection_ref.document()  # auto-generated ID
+            batch.set(doc_ref, item)
+
+        try:
+            batch.commit()
+            uploaded_count += len(chunk)
         except Exception as e:
-            print(f"Error uploading item to {collection_name}: {e}")
+            print(f"Error committing batch to {collection_name}: {e}")
 
     print(f"Successfully uploaded {uploaded_count} documents to '{collection_name}'.")
 